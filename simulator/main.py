@@ -1,11 +1,11 @@
 import yaml
 import os
-import pandas as pd
+import numpy as np
 from pathlib import Path
 from datetime import datetime
 
 from src.engine import SimulationEngine
-from src import SimulationEngine, run_pipeline
+from src import SimulationEngine, run_monte_carlo, run_pipeline
 
 def load_config(config_path):
     """Loads the simulation configuration from a YAML file."""
@@ -52,8 +52,8 @@ def generate_neighborhood(config):
 
     return houses
 
-def save_results(df_results, output_dir):
-    """Saves the simulation results to a CSV file with a timestamp."""
+def save_results(df_results, output_dir, output_format='parquet'):
+    """Saves the simulation results to a Parquet (default) or CSV file with a timestamp."""
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
         
@@ -61,26 +61,37 @@ def save_results(df_results, output_dir):
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     
     # Create a unique filename
-    filename = os.path.join(output_dir, f'simulation_results_{timestamp}.csv')
+    extension = 'csv' if output_format == 'csv' else 'parquet'
+    filename = os.path.join(output_dir, f'simulation_results_{timestamp}.{extension}')
     
     # Save the file
-    df_results.to_csv(filename, index=False)
+    if output_format == 'csv':
+        # Written in chunks with a fixed float format to limit formatting cost
+        df_results.to_csv(filename, index=False, chunksize=100_000, float_format='%.4f')
+    else:
+        # Columnar binary format: no per-value string formatting, much smaller files
+        df_results.to_parquet(filename, index=False, compression='snappy', engine='pyarrow')
     print(f"\n✅ Results saved to: {filename}")
 
-def print_summary(df):
-    """Prints a quick summary of the simulation to the console."""
+def print_summary(results):
+    """Prints a quick summary of the simulation to the console (works on the raw arrays)."""
     print("\n" + "="*40)
     print("       SIMULATION SUMMARY")
     print("="*40)
     
-    total_days = df['day'].max() + 1
-    total_solar = df['solar_gen_kw'].sum()
-    total_load = df['load_kw'].sum()
-    total_import = df['grid_import_kw'].sum()
-    total_export = df['grid_export_kw'].sum()
-    net_cost = df['cost_cents'].sum() / 100 
+    # Monte Carlo runs: report the average replicate
+    n_replicates = len(np.unique(results['replicate_id'])) if 'replicate_id' in results else 1
+
+    total_days = results['day'].max() + 1
+    total_solar = results['solar_gen_kw'].sum() / n_replicates
+    total_load = results['load_kw'].sum() / n_replicates
+    total_import = results['grid_import_kw'].sum() / n_replicates
+    total_export = results['grid_export_kw'].sum() / n_replicates
+    net_cost = results['cost_cents'].sum() / 100 / n_replicates
 
     print(f"Duration:      {total_days} Days")
+    if n_replicates > 1:
+        print(f"Replicates:    {n_replicates} (averages per replicate)")
     print(f"Total Load:    {total_load:.2f} kWh")
     print(f"Total Solar:   {total_solar:.2f} kWh")
     print(f"Grid Import:   {total_import:.2f} kWh")
@@ -108,13 +119,18 @@ if __name__ == "__main__":
         print(f"   Generated {len(config['houses'])} houses in the neighborhood.")
 
         # 4. Initialize and Run Engine
-        engine = SimulationEngine(config)
-        print("   Running simulation...")
-        results_df = engine.run()
+        n_replicates = config['simulation'].get('replicates', 1)
+        if n_replicates > 1:
+            print(f"   Running {n_replicates} Monte Carlo replicates in parallel...")
+            results = run_monte_carlo(config, n_replicates)
+        else:
+            engine = SimulationEngine(config)
+            print("   Running simulation...")
+            results = engine.run()
 
         # 5. Save and Show Results
-        save_results(results_df, OUTPUT_DIR)
-        print_summary(results_df)
+        save_results(results.to_dataframe(), OUTPUT_DIR, config['simulation'].get('output_format', 'parquet'))
+        print_summary(results)
 
         # 6. Run pipeline
         print("\n⚙️ Preparing dashboard data...")
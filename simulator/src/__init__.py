@@ -16,4 +16,4 @@ from .neighborhood import House, Neighborhood
 from .preparation import run_pipeline
 
 # 6. Expose the Main Simulation Engine
-from .engine import SimulationEngine
+from .engine import SimulationEngine, SimulationResults, run_monte_carlo
@@ -1,5 +1,5 @@
-import random
 import math
+import numpy as np
 
 class Battery:
     """
@@ -40,6 +40,11 @@ class Battery:
         # sqrt(0.90) approx 0.948
         self.efficiency_ow = math.sqrt(self.efficiency_rt)
 
+        # Precomputed once so charge/discharge only multiply:
+        # the inverse efficiency and the energy floor (minimum charge level)
+        self.inv_efficiency_ow = 1.0 / self.efficiency_ow
+        self.min_energy_kwh = self.capacity_kwh * self.min_soc_limit_pct
+
     def charge(self, energy_input_kwh):
         """
         Attempts to charge the battery with a specific amount of energy.
@@ -62,7 +67,7 @@ class Battery:
         if energy_to_store > space_available:
             energy_to_store = space_available
             # Reverse calculation (How much input was actually needed to fill this space)
-            real_input = space_available / self.efficiency_ow
+            real_input = space_available * self.inv_efficiency_ow
         else:
             real_input = energy_input_kwh
 
@@ -81,21 +86,18 @@ class Battery:
         Returns:
             float: The actual energy supplied by the battery.
         """
-        # 1. Calculate the energy floor (minimum charge level)
-        min_energy_kwh = self.capacity_kwh * self.min_soc_limit_pct
-        
-        # 2. Calculate usable energy above that floor
-        available_energy = self.current_energy_kwh - min_energy_kwh
+        # 1. Calculate usable energy above the (precomputed) floor
+        available_energy = self.current_energy_kwh - self.min_energy_kwh
 
         # If battery is too low, we cannot provide anything
         if available_energy <= 0:
             return 0.0
 
-        # 3. Calculate internal energy drain required
+        # 2. Calculate internal energy drain required
         # To output 1 kWh, we must drain >1 kWh due to internal resistance/losses.
-        energy_to_drain = energy_needed_kwh / self.efficiency_ow
+        energy_to_drain = energy_needed_kwh * self.inv_efficiency_ow
 
-        # 4. Check if we have enough energy
+        # 3. Check if we have enough energy
         if energy_to_drain > available_energy:
             # We don't have enough; drain everything usable
             energy_to_drain = available_energy
@@ -105,7 +107,7 @@ class Battery:
             # We have enough
             real_output = energy_needed_kwh
 
-        # 5. Update state
+        # 4. Update state
         self.current_energy_kwh -= energy_to_drain
 
         return real_output
@@ -129,6 +131,23 @@ class SolarPanel:
         # Peak generation capacity in kW (e.g., 5.0 kW)
         self.peak_power_kw = config_data.get('panel_peak_kw', 5.0)
 
+        # Solar generation window: roughly 6:00 AM to 6:00 PM
+        # We map the hours of daylight to Pi radians (180 degrees)
+        self.sunrise_hour = 6
+        self.sunset_hour = 18
+        self.pi_over_daylight = math.pi / (self.sunset_hour - self.sunrise_hour)
+
+        # Precompute the clear-sky curve for every minute of a day
+        # (same sine model as get_generation, evaluated only once; indexed
+        # by minute of day, so it is exact for any integer time step)
+        hour_grid = np.arange(24 * 60) / 60
+        daylight = (hour_grid >= self.sunrise_hour) & (hour_grid <= self.sunset_hour)
+        self.gen_table = np.where(
+            daylight,
+            self.peak_power_kw * np.sin((hour_grid - self.sunrise_hour) * self.pi_over_daylight),
+            0.0
+        ).astype(np.float32)
+
     def get_generation(self, time_of_day_hour, cloud_coverage_pct):
         """
         Calculates solar power output for a specific time and weather condition.
@@ -140,18 +159,15 @@ class SolarPanel:
         Returns:
             float: Generated power in kW.
         """
-        # Solar generation window: roughly 6:00 AM to 6:00 PM
-        sunrise_hour = 6
-        sunset_hour = 18
+        sunrise_hour = self.sunrise_hour
+        sunset_hour = self.sunset_hour
 
         # 1. Check if it's night time
         if time_of_day_hour < sunrise_hour or time_of_day_hour > sunset_hour:
             return 0.0
 
         # 2. Calculate Sun Angle (0 to Pi radians)
-        # We map the 12 hours of daylight to Pi radians (180 degrees)
-        daylight_duration = sunset_hour - sunrise_hour
-        sun_angle = (time_of_day_hour - sunrise_hour) * (math.pi / daylight_duration)
+        sun_angle = (time_of_day_hour - sunrise_hour) * self.pi_over_daylight
 
         # 3. Calculate Base Generation using Sine Wave
         base_generation = self.peak_power_kw * math.sin(sun_angle)
@@ -170,13 +186,16 @@ class Inverter:
     Handles power clipping logic and simulates random hardware failures.
     """
 
-    def __init__(self, config_data):
+    def __init__(self, config_data, rng=None):
         """
         Initializes the inverter parameters.
 
         Args:
             config_data (dict): The 'solar' section from simulation_config.json.
+            rng (np.random.Generator): Shared random generator (new one if None).
         """
+        self.rng = rng if rng is not None else np.random.default_rng()
+
         # Maximum power output (Clipping limit) 
         self.max_output_kw = config_data.get('inverter_max_kw', 4.0)
         
@@ -209,17 +228,48 @@ class Inverter:
 
         # 2. If working, roll the dice for a new failure
         # Random failure event that occurs on average once every 200 days 
-        if random.random() < self.failure_probability:
+        if self.rng.random() < self.failure_probability:
             self.is_broken = True
             # Duration between 4 to 72 hours 
-            self.hours_until_repair = random.randint(
+            self.hours_until_repair = int(self.rng.integers(
                 self.min_repair_time, 
-                self.max_repair_time
-            )
+                self.max_repair_time + 1
+            ))
             return False
 
         return True
 
+    def get_failure_schedule(self, n_steps):
+        """
+        Precomputes the operational status for a whole timeline.
+        Same model as calling check_status once per step, but every dice
+        roll is drawn at once.
+
+        Args:
+            n_steps (int): Number of time steps to simulate.
+
+        Returns:
+            np.ndarray: Boolean mask, True where the inverter is broken.
+        """
+        broken_mask = np.zeros(n_steps, dtype=bool)
+
+        # 1. Roll the dice for every step at once
+        candidates = np.flatnonzero(self.rng.random(n_steps) < self.failure_probability)
+
+        # 2. Draw a repair duration for every candidate in one call
+        durations = self.rng.integers(self.min_repair_time, self.max_repair_time + 1, size=len(candidates))
+
+        # 3. March through the candidates: a new failure can only start
+        #    once the previous one has been repaired
+        repaired_at = 0
+        for start, duration in zip(candidates.tolist(), durations.tolist()):
+            if start < repaired_at:
+                continue
+            broken_mask[start:start + duration] = True
+            repaired_at = start + duration
+
+        return broken_mask
+
     def clip_power(self, dc_power_kw):
         """
         Limits the power output based on inverter capacity.
@@ -1,65 +1,176 @@
-import simpy
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
 import pandas as pd
 from src.neighborhood import Neighborhood
 from src.environment import Weather, UtilityGrid
 from src.strategy import EnergyManager
 
+# Columns filled by each house simulation
+HOUSE_COLUMNS = [
+    'solar_gen_kw',
+    'load_kw',
+    'battery_soc_kwh',
+    'grid_import_kw',
+    'grid_export_kw',
+    'self_consumption_kw'
+]
+
+class SimulationResults:
+    """
+    Columnar simulation results: one NumPy array per logged variable.
+    Stays in NumPy for aggregation; a DataFrame is built only when needed.
+    """
+
+    def __init__(self, arrays):
+        """
+        Wraps the result columns.
+
+        Args:
+            arrays (dict): Column name -> np.ndarray (all of the same length).
+        """
+        self.arrays = arrays
+
+    def __getitem__(self, column):
+        return self.arrays[column]
+
+    def __contains__(self, column):
+        return column in self.arrays
+
+    def __len__(self):
+        return len(next(iter(self.arrays.values()), ()))
+
+    def to_dataframe(self):
+        """Wraps the arrays in a DataFrame without copying them."""
+        return pd.DataFrame({column: array for column, array in self.arrays.items()}, copy=False)
+
+    @classmethod
+    def concat(cls, results):
+        """Stacks several results (same columns) into one."""
+        columns = results[0].arrays.keys()
+        return cls({column: np.concatenate([r[column] for r in results]) for column in columns})
+
+
 class SimulationEngine:
     """
-    Orchestrates the simulation using SimPy.
-    Connects the global environment with the individual house processes.
+    Orchestrates the simulation as a fixed-step time series.
+    Every step has the same size, so the whole timeline is precomputed with
+    NumPy and each house is evaluated over it in a single pass.
     """
 
-    def __init__(self, config):
+    def __init__(self, config, seed=None):
         self.config = config
-        self.env = simpy.Environment()
-        
+
         sim_config = config['simulation']
-        self.duration_hours = sim_config['duration_days'] * 24
+        self.duration_days = sim_config['duration_days']
+        if self.duration_days <= 0:
+            raise ValueError(f"duration_days must be positive, got {self.duration_days}.")
+        self.duration_hours = self.duration_days * 24
         self.step_minutes = sim_config.get('time_step_minutes', 60)
-        
+
+        # Single random generator shared by every stochastic component
+        # (a fixed seed makes the whole run reproducible; an explicit seed
+        # overrides the config one, e.g. for Monte Carlo replicates)
+        self.rng = np.random.default_rng(seed if seed is not None else sim_config.get('seed'))
+
         # 1. Initialize Global Entities
-        self.weather = Weather(sim_config)
+        self.weather = Weather(sim_config, self.rng)
         self.grid = UtilityGrid(config['grid'])
         self.energy_manager = EnergyManager(config['strategy'])
-        
+
         # 2. Initialize the Neighborhood
-        self.neighborhood = Neighborhood(config['houses'])
-        
-        # 3. Shared state & Data Logging
-        # This allows all houses to see the exact same weather at any given minute
-        self.weather_state = {'cloud_cover': 0.0}
-        self.results = []
-
-    def _global_clock(self):
-        """
-        SimPy generator process. Acts as the global environment updater.
-        Updates the weather just before the houses react to it.
-        """
-        while True:
-            self.weather_state['cloud_cover'] = self.weather.get_cloud_coverage()
-            yield self.env.timeout(self.step_minutes)
+        self.neighborhood = Neighborhood(config['houses'], self.rng)
+
+        # 3. Data Logging (columnar arrays, allocated by run)
+        self.results = {}
 
     def run(self):
         """
-        Starts the simulation loop using multiple generators.
+        Runs the simulation over the whole timeline.
+
+        Returns:
+            SimulationResults: One entry per house and time step.
         """
-        # 1. Start the global clock process
-        self.env.process(self._global_clock())
-        
-        # 2. Start an independent process for EACH house
-        for house in self.neighborhood.houses:
-            self.env.process(house.live(
-                env=self.env,
-                step_minutes=self.step_minutes,
-                weather_state=self.weather_state,
+        # 1. Build the shared timeline (in minutes)
+        # Integer arithmetic only: minute and hour of day, and day number
+        time_min = np.arange(0, self.duration_hours * 60, self.step_minutes)
+        minute_of_day = (time_min % (60 * 24)).astype(np.int32)
+        hour_idx = minute_of_day // 60
+        days = (time_min // (60 * 24)).astype(np.int32)
+        n_steps = len(time_min)
+
+        # 2. Global weather
+        # One cloud coverage per day, shared by every step of that day and
+        # by all houses (indexing by day also works if steps don't divide a day,
+        # and the solar curve is indexed by minute so it stays exact; sized
+        # from the timeline so a fractional duration_days gets its last day)
+        cloud_daily = self.weather.get_cloud_coverage_batch(int(days[-1]) + 1)
+        cloud_cover = cloud_daily[days]
+
+        # 3. Preallocate one column per logged variable (house after house)
+        houses = self.neighborhood.houses
+        n_houses = len(houses)
+        n_rows = n_houses * n_steps
+
+        self.results = {
+            'time_min': np.tile(time_min, n_houses),
+            'day': np.tile(days, n_houses),
+            'hour': np.tile(hour_idx, n_houses),
+            'house_id': np.repeat(np.array([h.house_id for h in houses], dtype=object), n_steps),
+            'house_type': np.repeat(np.array([h.house_type for h in houses], dtype=object), n_steps),
+            'wealth_level': np.repeat(np.array([h.wealth for h in houses], dtype=object), n_steps),
+        }
+        for column in HOUSE_COLUMNS:
+            self.results[column] = np.empty(n_rows, dtype=np.float32)
+
+        # 4. Simulate each house over the same timeline, writing into its rows
+        for i, house in enumerate(houses):
+            rows = slice(i * n_steps, (i + 1) * n_steps)
+            house.simulate(
+                minute_of_day=minute_of_day,
+                cloud_cover=cloud_cover,
                 grid=self.grid,
                 energy_manager=self.energy_manager,
-                results=self.results
-            ))
-        
-        # 3. Run the simulation
-        self.env.run(until=self.duration_hours * 60) # Run in minutes
-        
-        # 4. Return results as a DataFrame
-        return pd.DataFrame(self.results)
\ No newline at end of file
+                out={column: self.results[column][rows] for column in HOUSE_COLUMNS}
+            )
+
+        # 5. Calculate Economics for all rows in one vectorized pass
+        self.results['cost_cents'] = self.grid.calculate_cost(
+            self.results['grid_import_kw'],
+            self.results['grid_export_kw']
+        )
+
+        # 6. Return the columns as they are (no DataFrame on the hot path)
+        return SimulationResults(self.results)
+
+
+def _run_replicate(config, seed, replicate_id):
+    """
+    Runs a single Monte Carlo replicate (module level so worker processes can pickle it).
+    """
+    results = SimulationEngine(config, seed=seed).run()
+    replicate_ids = np.full(len(results), replicate_id, dtype=np.int32)
+    return SimulationResults({'replicate_id': replicate_ids, **results.arrays})
+
+
+def run_monte_carlo(config, n_replicates, max_workers=None):
+    """
+    Runs independent replicates of the simulation in parallel processes.
+    Each replicate gets its own random stream derived from the config seed,
+    so the whole ensemble is reproducible when a seed is set.
+
+    Args:
+        config (dict): Full simulation configuration (with 'houses').
+        n_replicates (int): Number of replicates to run.
+        max_workers (int): Worker processes (defaults to the number of cores).
+
+    Returns:
+        SimulationResults: Results of all replicates, with a 'replicate_id' column.
+    """
+    seeds = np.random.SeedSequence(config['simulation'].get('seed')).spawn(n_replicates)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        replicates = list(executor.map(_run_replicate, repeat(config), seeds, range(n_replicates)))
+
+    return SimulationResults.concat(replicates)
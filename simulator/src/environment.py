@@ -1,4 +1,4 @@
-import random
+import numpy as np
 
 class Weather:
     """
@@ -8,14 +8,16 @@ class Weather:
     daily cloud patterns.
     """
 
-    def __init__(self, config_data):
+    def __init__(self, config_data, rng=None):
         """
         Initializes the weather model.
 
         Args:
             config_data (dict): The 'simulation' section from simulation_config.json.
+            rng (np.random.Generator): Shared random generator (new one if None).
         """
         self.season = config_data.get('season', 'Summer')
+        self.rng = rng if rng is not None else np.random.default_rng()
 
         # Probability weights for cloud coverage levels:
         # (Clear, Partly Cloudy, Mostly Cloudy, Overcast)
@@ -26,6 +28,12 @@ class Weather:
             'Winter': [0.3, 0.4, 0.2, 0.1]
         }
 
+        # Resolved once: weights of the current season and the coverage
+        # range (low, high) of each category
+        self.weights = self.season_weights.get(self.season, [0.25, 0.25, 0.25, 0.25])
+        self.category_lows = np.array([0.0, 0.2, 0.6, 0.8], dtype=np.float32)
+        self.category_highs = np.array([0.2, 0.6, 0.8, 1.0], dtype=np.float32)
+
     def get_cloud_coverage(self):
         """
         Generates a random cloud coverage factor for the day.
@@ -34,21 +42,42 @@ class Weather:
             float: A value between 0.0 (Clear) and 1.0 (Overcast).
         """
         # 1. Get weights for the current season
-        weights = self.season_weights.get(self.season, [0.25, 0.25, 0.25, 0.25])
+        weights = self.weights
         
         # 2. Select a weather category based on weights
         # Categories: 0=Clear, 1=Partly, 2=Mostly, 3=Overcast
-        category = random.choices([0, 1, 2, 3], weights=weights, k=1)[0]
+        category = self.rng.choice(4, p=weights)
         
         # 3. Generate specific coverage percentage based on category ranges
         if category == 0:   # Clear (0.0 - 0.2)
-            return random.uniform(0.0, 0.2)
+            return self.rng.uniform(0.0, 0.2)
         elif category == 1: # Partly Cloudy (0.2 - 0.6)
-            return random.uniform(0.2, 0.6)
+            return self.rng.uniform(0.2, 0.6)
         elif category == 2: # Mostly Cloudy (0.6 - 0.8)
-            return random.uniform(0.6, 0.8)
+            return self.rng.uniform(0.6, 0.8)
         else:               # Overcast (0.8 - 1.0) - PDF says 0.8-0.9, but 1.0 is safer cap
-            return random.uniform(0.8, 1.0)
+            return self.rng.uniform(0.8, 1.0)
+
+    def get_cloud_coverage_batch(self, n):
+        """
+        Generates n cloud coverage factors at once (same model as get_cloud_coverage).
+
+        Args:
+            n (int): Number of samples to draw.
+
+        Returns:
+            np.ndarray: Values between 0.0 (Clear) and 1.0 (Overcast), as float32.
+        """
+        rng = self.rng
+
+        # 1. Select all weather categories in one draw
+        categories = rng.choice(4, size=n, p=self.weights)
+
+        # 2. Gather the coverage range of each category
+        lows = self.category_lows[categories]
+        highs = self.category_highs[categories]
+
+        return lows + (highs - lows) * rng.random(n, dtype=np.float32)
 
 
 class HomeLoad:
@@ -59,13 +88,15 @@ class HomeLoad:
     stochastic spikes during peak hours.
     """
 
-    def __init__(self, config_data):
+    def __init__(self, config_data, rng=None):
         """
         Initializes the load profile.
 
         Args:
             config_data (dict): The 'load' section from simulation_config.json.
+            rng (np.random.Generator): Shared random generator (new one if None).
         """
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.base_load_kw = config_data.get('base_load_kw', 0.5)
         self.peak_load_kw = config_data.get('peak_load_kw', 3.0)
         self.peak_start = config_data.get('peak_start_hour', 18) # 6 PM
@@ -88,10 +119,10 @@ class HomeLoad:
         # Random spikes up to 3 kW during peak hours (6-9 PM)"
         if self.peak_start <= hour_of_day <= self.peak_end:
             # Higher probability of high spikes during peak time
-            spike = random.uniform(0, self.peak_load_kw)
+            spike = self.rng.uniform(0, self.peak_load_kw)
         else:
             # Lower spikes during off-peak (occasional usage)
-            spike = random.uniform(0, self.peak_load_kw * 0.1) # 10% of peak
+            spike = self.rng.uniform(0, self.peak_load_kw * 0.1) # 10% of peak
 
         return current_load + spike
 
@@ -117,13 +148,14 @@ class UtilityGrid:
     def calculate_cost(self, imported_kwh, exported_kwh):
         """
         Calculates the financial balance for a time period.
+        Also works element-wise on whole arrays of steps.
         
         Args:
-            imported_kwh (float): Energy bought from grid.
-            exported_kwh (float): Energy sold to grid.
+            imported_kwh (float or np.ndarray): Energy bought from grid.
+            exported_kwh (float or np.ndarray): Energy sold to grid.
             
         Returns:
-            float: Net cost (positive = you pay, negative = you earn).
+            float or np.ndarray: Net cost (positive = you pay, negative = you earn).
         """
         cost = imported_kwh * self.cost_import
         earnings = exported_kwh * self.price_export
@@ -0,0 +1,185 @@
+import numpy as np
+from numba import njit
+
+from src.strategy import CHARGE_PRIORITY, PRODUCE_PRIORITY
+
+# Compiled versions of the per-step logic of Battery, Inverter and EnergyManager.
+# They work on plain floats/ints only (no Python objects), so the whole
+# carried-state loop runs as machine code.
+#   - cache=True keeps the compiled code on disk, so only the very first run
+#     pays the JIT cost.
+#   - fastmath=True lets LLVM reorder/fuse the float arithmetic (FMA, SIMD).
+#     Results may differ from the pure Python classes in the last bits,
+#     which is irrelevant for a stochastic energy simulation.
+#   - boundscheck=False: every index comes from range(n_steps), except the
+#     gen_table lookup by minute_of_day, which House.simulate checks first.
+_kernel = njit(cache=True, fastmath=True, boundscheck=False)
+
+# All quantities are float32 (see engine.py); a float64 literal such as 0.0
+# would silently promote the whole state loop back to float64.
+_ZERO = np.float32(0.0)
+_ONE = np.float32(1.0)
+
+@_kernel
+def _charge(energy_kwh, energy_input_kwh, capacity_kwh, efficiency_ow, inv_efficiency_ow):
+    """
+    Same math as Battery.charge, written with min() instead of branches.
+
+    Returns:
+        tuple: (energy consumed from the source, new stored energy)
+    """
+    # Clipping: only take what is needed to fill the battery
+    space_available = capacity_kwh - energy_kwh
+    energy_to_store = min(energy_input_kwh * efficiency_ow, space_available)
+    real_input = min(energy_input_kwh, space_available * inv_efficiency_ow)
+
+    return real_input, energy_kwh + energy_to_store
+
+
+@_kernel
+def _discharge(energy_kwh, energy_needed_kwh, min_energy_kwh, efficiency_ow, inv_efficiency_ow):
+    """
+    Same math as Battery.discharge, written with min()/max() instead of branches.
+
+    Returns:
+        tuple: (energy supplied by the battery, new stored energy)
+    """
+    # Usable energy above the floor (nothing if the battery is too low)
+    available_energy = max(energy_kwh - min_energy_kwh, _ZERO)
+
+    # Drain what is needed, or everything usable if that is not enough
+    energy_to_drain = min(energy_needed_kwh * inv_efficiency_ow, available_energy)
+    real_output = min(energy_needed_kwh, available_energy * efficiency_ow)
+
+    return real_output, energy_kwh - energy_to_drain
+
+
+#  STRATEGY KERNELS 
+# Each one returns (solar_to_load, solar_to_battery, solar_to_grid,
+# grid_import, battery_discharge, curtailed, new stored energy).
+
+@_kernel
+def _flow_load_priority(solar, load, energy_kwh, capacity_kwh, efficiency_ow,
+                        inv_efficiency_ow, min_energy_kwh, grid_limit):
+    """Power the house first, charge the battery second, export excess last."""
+    # 1. Power the House (battery, then grid, cover the deficit)
+    to_load = min(solar, load)
+    excess = solar - to_load
+    deficit = load - to_load
+    discharged, energy_kwh = _discharge(energy_kwh, deficit, min_energy_kwh, efficiency_ow, inv_efficiency_ow)
+    grid_import = deficit - discharged
+
+    # 2. Charge Battery with Excess
+    charged, energy_kwh = _charge(energy_kwh, excess, capacity_kwh, efficiency_ow, inv_efficiency_ow)
+    excess -= charged
+
+    # 3. Export to Grid, 4. Curtail the rest
+    to_grid = min(excess, grid_limit)
+    curtailed = excess - to_grid
+
+    return to_load, charged, to_grid, grid_import, discharged, curtailed, energy_kwh
+
+
+@_kernel
+def _flow_charge_priority(solar, load, energy_kwh, capacity_kwh, efficiency_ow,
+                          inv_efficiency_ow, min_energy_kwh, grid_limit):
+    """Charge the battery first, power the house second, export excess last."""
+    # 1. Charge Battery First
+    charged, energy_kwh = _charge(energy_kwh, solar, capacity_kwh, efficiency_ow, inv_efficiency_ow)
+    remaining = solar - charged
+
+    # 2. Power House Second (the deficit comes from the grid, never the battery)
+    to_load = min(remaining, load)
+    grid_import = load - to_load
+    remaining -= to_load
+
+    # 3. Export Third
+    to_grid = min(remaining, grid_limit)
+    curtailed = remaining - to_grid
+
+    return to_load, charged, to_grid, grid_import, _ZERO, curtailed, energy_kwh
+
+
+@_kernel
+def _flow_produce_priority(solar, load, energy_kwh, capacity_kwh, efficiency_ow,
+                           inv_efficiency_ow, min_energy_kwh, grid_limit):
+    """Export first, charge the battery second, power the house last."""
+    # 1. Export First
+    to_grid = min(solar, grid_limit)
+    remaining = solar - to_grid
+
+    # 2. Charge Battery Second
+    charged, energy_kwh = _charge(energy_kwh, remaining, capacity_kwh, efficiency_ow, inv_efficiency_ow)
+    remaining -= charged
+
+    # 3. Power House Last (battery, then grid, cover the deficit)
+    to_load = min(remaining, load)
+    remaining -= to_load
+    deficit = load - to_load
+    discharged, energy_kwh = _discharge(energy_kwh, deficit, min_energy_kwh, efficiency_ow, inv_efficiency_ow)
+    grid_import = deficit - discharged
+
+    return to_load, charged, to_grid, grid_import, discharged, remaining, energy_kwh
+
+
+@_kernel
+def _step_loop(minute_of_day, cloud_cover, gen_table, spike_u, broken_mask, strategy_id,
+               base_load_kw, peak_load_kw, off_peak_load_kw, peak_start_min, peak_end_min,
+               capacity_kwh, efficiency_ow, inv_efficiency_ow, min_energy_kwh, initial_energy_kwh,
+               max_output_kw, export_limit_kw,
+               ac_solar_kw, load_kw, battery_soc_kwh, grid_import_kw, grid_export_kw,
+               self_consumption_kw):
+    """
+    Runs a whole house simulation in one fused pass: solar and load physics,
+    inverter, battery SoC and the EMS strategy. Each step's intermediate
+    values stay in registers; only the logged columns are written.
+
+    Args:
+        minute_of_day (np.ndarray): Integer minute of day of every step (shared by all houses).
+        cloud_cover (np.ndarray): Cloud coverage of every step (shared).
+        gen_table (np.ndarray): Clear-sky solar curve per minute of day (SolarPanel.gen_table).
+        spike_u (np.ndarray): Uniform [0, 1) draws scaling the load spikes.
+        broken_mask (np.ndarray): True where the inverter is broken
+                                  (see Inverter.get_failure_schedule).
+        strategy_id (int): One of the strategy ids defined in strategy.py.
+        (scalar args): HomeLoad, Battery, Inverter and grid export parameters.
+        (array args): Preallocated output columns, written by step index.
+
+    Returns:
+        float: Energy stored in the battery at the end of the run.
+    """
+    n_steps = minute_of_day.shape[0]
+
+    energy_kwh = initial_energy_kwh
+
+    for i in range(n_steps):
+        # 1. Physics: solar curve reduced by clouds, inverter output
+        #    (clipped, or nothing while broken) and house demand
+        dc_solar = gen_table[minute_of_day[i]] * (_ONE - cloud_cover[i])
+        solar = _ZERO if broken_mask[i] else min(dc_solar, max_output_kw)
+
+        # Peak window compared in minutes of day, so it ends at peak_end:00 sharp
+        is_peak = peak_start_min <= minute_of_day[i] <= peak_end_min
+        load = base_load_kw + spike_u[i] * (peak_load_kw if is_peak else off_peak_load_kw)
+
+        # 2. Energy flow (strategy_id is the same for every step)
+        if strategy_id == CHARGE_PRIORITY:
+            flow = _flow_charge_priority(solar, load, energy_kwh, capacity_kwh,
+                                         efficiency_ow, inv_efficiency_ow, min_energy_kwh, export_limit_kw)
+        elif strategy_id == PRODUCE_PRIORITY:
+            flow = _flow_produce_priority(solar, load, energy_kwh, capacity_kwh,
+                                          efficiency_ow, inv_efficiency_ow, min_energy_kwh, export_limit_kw)
+        else:
+            flow = _flow_load_priority(solar, load, energy_kwh, capacity_kwh,
+                                       efficiency_ow, inv_efficiency_ow, min_energy_kwh, export_limit_kw)
+        to_load, to_battery, to_grid, grid_import, _, _, energy_kwh = flow
+
+        # 3. Log the step
+        ac_solar_kw[i] = solar
+        load_kw[i] = load
+        battery_soc_kwh[i] = energy_kwh
+        grid_import_kw[i] = grid_import
+        grid_export_kw[i] = to_grid
+        self_consumption_kw[i] = to_load + to_battery
+
+    return energy_kwh
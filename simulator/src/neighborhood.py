@@ -1,12 +1,14 @@
+import numpy as np
 from src.components import Battery, SolarPanel, Inverter
 from src.environment import HomeLoad
+from src.kernels import _step_loop
 
 class House:
     """
     Represents a single household in the simulation.
-    Contains its own hardware and acts as an independent SimPy process.
+    Contains its own hardware and simulates its own timeline.
     """
-    def __init__(self, house_id, config_data):
+    def __init__(self, house_id, config_data, rng=None):
         self.house_id = house_id
         self.house_type = config_data['type']
         self.wealth = config_data['wealth']
@@ -14,67 +16,63 @@ class House:
         # Initialize individual hardware
         self.battery = Battery(config_data['battery'])
         self.solar_panel = SolarPanel(config_data['solar'])
-        self.inverter = Inverter(config_data['solar'])
-        self.home_load = HomeLoad(config_data['load'])
+        self.inverter = Inverter(config_data['solar'], rng)
+        self.home_load = HomeLoad(config_data['load'], rng)
 
-    def live(self, env, step_minutes, weather_state, grid, energy_manager, results):
+    def simulate(self, minute_of_day, cloud_cover, grid, energy_manager, out):
         """
-        SimPy generator process. Simulates the house's activity over time.
+        Simulates the house's activity over the whole timeline.
+
+        Args:
+            minute_of_day (np.ndarray): Integer minute of day (0-1439) of every step.
+            cloud_cover (np.ndarray): Shared cloud coverage of every step.
+            grid (UtilityGrid): Grid constraints and prices.
+            energy_manager (EnergyManager): The EMS deciding the energy flow.
+            out (dict): Preallocated result columns for this house (one value
+                        per step), filled in place.
         """
-        while True:
-            # 1. Understand current time
-            current_time_min = env.now
-            current_hour = (current_time_min / 60) % 24
-            day_number = int(current_time_min / (60 * 24))
+        n_steps = len(minute_of_day)
 
-            # 2. Get global weather for this timestep
-            cloud_cover = weather_state.get('cloud_cover', 0.0)
+        # 1. Draw every random input up front
+        # Load spikes: uniform fraction of the (peak or off-peak) spike size
+        spike_u = self.home_load.rng.random(n_steps, dtype=np.float32)
 
-            # 3. Calculate Physics
-            dc_solar_kw = self.solar_panel.get_generation(current_hour, cloud_cover)
-            ac_solar_kw = self.inverter.clip_power(dc_solar_kw)
-            load_kw = self.home_load.get_current_load(current_hour)
+        # Inverter: failure timeline
+        broken_mask = self.inverter.get_failure_schedule(n_steps)
 
-            # 4. Execute Strategy
-            flow = energy_manager.decide_energy_flow(
-                solar_gen_kw=ac_solar_kw, 
-                load_demand_kw=load_kw, 
-                battery=self.battery, 
-                grid_limit_kw=grid.export_limit_kw
+        # The kernel runs without bounds checks: every step must fall inside
+        # the solar curve (one entry per minute of day)
+        gen_table = self.solar_panel.gen_table
+        if minute_of_day.max() >= len(gen_table):
+            raise ValueError(
+                f"minute_of_day reaches {minute_of_day.max()} but the solar curve of "
+                f"{self.house_id} only has {len(gen_table)} minutes per day."
             )
 
-            # 5. Calculate Economics
-            step_cost = grid.calculate_cost(flow['grid_import'], flow['solar_to_grid'])
-
-            # 6. Log Data (Including self-consumption)
-            self_consumption = flow.get('solar_to_load', 0.0) + flow.get('solar_to_battery', 0.0)
-            
-            results.append({
-                'time_min': current_time_min,
-                'day': day_number,
-                'hour': current_hour,
-                'house_id': self.house_id,
-                'house_type': self.house_type,
-                'wealth_level': self.wealth,
-                'solar_gen_kw': ac_solar_kw,
-                'load_kw': load_kw,
-                'battery_soc_kwh': self.battery.current_energy_kwh,
-                'grid_import_kw': flow['grid_import'],
-                'grid_export_kw': flow['solar_to_grid'],
-                'self_consumption_kw': self_consumption,
-                'cost_cents': step_cost
-            })
-
-            # 7. Yield control back to SimPy until the next step
-            yield env.timeout(step_minutes)
+        # 2. Run physics, inverter, battery and strategy in one compiled pass
+        # Only plain float32 scalars/arrays are passed: the loop never touches Python objects
+        load = self.home_load
+        battery = self.battery
+        battery.current_energy_kwh = _step_loop(
+            minute_of_day, cloud_cover, gen_table, spike_u, broken_mask,
+            energy_manager.strategy_id,
+            np.float32(load.base_load_kw), np.float32(load.peak_load_kw),
+            np.float32(load.peak_load_kw * 0.1), load.peak_start * 60, load.peak_end * 60,
+            np.float32(battery.capacity_kwh), np.float32(battery.efficiency_ow),
+            np.float32(battery.inv_efficiency_ow), np.float32(battery.min_energy_kwh),
+            np.float32(battery.current_energy_kwh),
+            np.float32(self.inverter.max_output_kw), np.float32(grid.export_limit_kw),
+            out['solar_gen_kw'], out['load_kw'], out['battery_soc_kwh'], out['grid_import_kw'],
+            out['grid_export_kw'], out['self_consumption_kw']
+        )
 
 
 class Neighborhood:
     """
     A container class that builds and holds all the houses.
     """
-    def __init__(self, houses_config):
+    def __init__(self, houses_config, rng=None):
         self.houses = []
         for house_id, house_data in houses_config.items():
-            self.houses.append(House(house_id, house_data))
+            self.houses.append(House(house_id, house_data, rng))
             
\ No newline at end of file
@@ -4,17 +4,23 @@ import os
 import json
 from pathlib import Path
 
-def get_latest_csv(output_dir='outputs'):
-    """Finds the most recently generated CSV file."""
-    list_of_files = glob.glob(f'{output_dir}/*.csv')
+def get_latest_results(output_dir='outputs'):
+    """Finds the most recently generated results file (Parquet or CSV)."""
+    list_of_files = glob.glob(f'{output_dir}/*.parquet') + glob.glob(f'{output_dir}/*.csv')
     if not list_of_files:
-        raise FileNotFoundError("No CSV files were found in the outputs folder.")
+        raise FileNotFoundError("No Parquet or CSV files were found in the outputs folder.")
     latest_file = max(list_of_files, key=os.path.getctime)
     return latest_file
 
-def process_simulation_data(csv_path):
-    """Processes the CSV and extracts metrics for the Dashboard."""
-    df = pd.read_csv(csv_path)
+def process_simulation_data(results_path):
+    """Processes the results file and extracts metrics for the Dashboard."""
+    if str(results_path).endswith('.parquet'):
+        df = pd.read_parquet(results_path)
+    else:
+        df = pd.read_csv(results_path)
+
+    # Monte Carlo results: totals are reported per replicate (averages are unaffected)
+    n_replicates = df['replicate_id'].nunique() if 'replicate_id' in df.columns else 1
 
     # Prepare the Duck Curve & Battery Utilization
     # Calculate the net load (Consumption - Solar) for each hour
@@ -28,6 +34,7 @@ def process_simulation_data(csv_path):
         'solar_gen_kw': 'sum',
         'self_consumption_kw': 'sum'
     }).reset_index()
+    by_house_type[['load_kw', 'solar_gen_kw', 'self_consumption_kw']] /= n_replicates
 
     # Grouping by Wealth Level
     by_wealth = df.groupby('wealth_level').agg({
@@ -35,6 +42,7 @@ def process_simulation_data(csv_path):
         'solar_gen_kw': 'sum',
         'self_consumption_kw': 'sum'
     }).reset_index()
+    by_wealth[['load_kw', 'solar_gen_kw', 'self_consumption_kw']] /= n_replicates
 
     # By House 
     by_house = df.groupby(['house_id', 'house_type', 'wealth_level']).agg({
@@ -42,6 +50,7 @@ def process_simulation_data(csv_path):
         'cost_cents': lambda x: (x.sum() / 100), # Net cost
         'self_consumption_kw': 'sum'
     }).reset_index()
+    by_house[['grid_export_kw', 'cost_cents', 'self_consumption_kw']] /= n_replicates
 
     # Calculate savings per house (Self-consumption * rate)
     by_house['savings_dollars'] = (by_house['self_consumption_kw'] * 75) / 100
@@ -52,16 +61,16 @@ def process_simulation_data(csv_path):
     
     # Self-consumption savings (Assuming $0.75 import cost from config)
     # We calculate the money saved by consuming our own solar energy
-    total_self_consumed_kwh = float(df['self_consumption_kw'].sum())
+    total_self_consumed_kwh = float(df['self_consumption_kw'].sum() / n_replicates)
     savings_dollars = (total_self_consumed_kwh * 75) / 100 
 
     # General Summary (Enhanced)
     summary = {
-        'total_load': float(df['load_kw'].sum()),
-        'total_solar': float(df['solar_gen_kw'].sum()),
-        'total_import': float(df['grid_import_kw'].sum()),
-        'total_export': float(df['grid_export_kw'].sum()),
-        'net_cost': float(df['cost_cents'].sum() / 100),
+        'total_load': float(df['load_kw'].sum() / n_replicates),
+        'total_solar': float(df['solar_gen_kw'].sum() / n_replicates),
+        'total_import': float(df['grid_import_kw'].sum() / n_replicates),
+        'total_export': float(df['grid_export_kw'].sum() / n_replicates),
+        'net_cost': float(df['cost_cents'].sum() / 100 / n_replicates),
         'total_self_consumption': total_self_consumed_kwh,
         'estimated_savings_dollars': float(savings_dollars),
         'peak_load_hour': int(peak_load_hour),
@@ -96,9 +105,9 @@ def export_to_dashboard(dashboard_data):
 
 def run_pipeline():
     """Main function to run the entire preparation workflow."""
-    latest_csv = get_latest_csv()
-    print(f"Processing file: {latest_csv}")
-    data = process_simulation_data(latest_csv)
+    latest_results = get_latest_results()
+    print(f"Processing file: {latest_results}")
+    data = process_simulation_data(latest_results)
     export_to_dashboard(data)
 
 if __name__ == "__main__":